@@ -4,9 +4,21 @@ Exposes tools for querying election dates across US states.
 """
 
 import json
-from datetime import datetime, date
+import os
+import pickle
+import tempfile
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
@@ -16,643 +28,809 @@ DATA_PATH = Path(__file__).parent / "data" / "election_dates.json"
 SPECIAL_DATA_PATH = Path(__file__).parent / "data" / "special_elections.json"
 EAVS_DATA_PATH = Path(__file__).parent / "data" / "eavs_state_data.json"
 
+# Parsed JSON per path, keyed by (mtime_ns, size) so edits on disk are picked up
+_CACHE: dict[Path, tuple[tuple[int, int], dict]] = {}
+
+# Bump when the prepare hooks change shape so stale .pkl snapshots are rebuilt
+_PICKLE_VERSION = 2
+
+def _read_pickle_snapshot(path: Path, stat_key: tuple[int, int]) -> dict | None:
+    """Return the prepared data pickled next to ``path`` if it is still current."""
+    try:
+        with open(path.with_suffix(".pkl"), "rb") as f:
+            version, snapshot_key, parsed = pickle.load(f)
+    except Exception:
+        # Missing, truncated or corrupt snapshot (unpickling garbage can raise
+        # almost anything); fall back to parsing the JSON
+        return None
+    if version != _PICKLE_VERSION or snapshot_key != stat_key:
+        return None
+    return parsed
+
+def _write_pickle_snapshot(path: Path, stat_key: tuple[int, int], parsed: dict) -> None:
+    """Pickle prepared data next to ``path`` so fresh processes skip JSON parsing."""
+    pkl_path = path.with_suffix(".pkl")
+    try:
+        # Unique temp file, so concurrent server processes never share one
+        fd, tmp_name = tempfile.mkstemp(
+            dir=pkl_path.parent, prefix=f"{path.stem}.", suffix=".pkl.tmp"
+        )
+    except OSError:
+        # Read-only data directory; the in-process cache still applies
+        return
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((_PICKLE_VERSION, stat_key, parsed), f, protocol=5)
+        os.replace(tmp_name, pkl_path)
+    except OSError:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+
+def _load_json_cached(path: Path, prepare=None) -> dict:
+    """Load a JSON file, reusing the parsed result until the file changes.
+
+    ``prepare`` is called once on each freshly parsed object to attach
+    derived indexes, so the work is not repeated on cache hits. The prepared
+    object is also pickled next to the JSON file for the next process.
+    """
+    stat = path.stat()
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    parsed = _read_pickle_snapshot(path, stat_key)
+    if parsed is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+        parsed = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        if prepare is not None:
+            prepare(parsed)
+        _write_pickle_snapshot(path, stat_key, parsed)
+    _CACHE[path] = (stat_key, parsed)
+    return parsed
+
+def _build_next_election(state: dict) -> dict:
+    """get_next_election result for a state, with day counts left unset."""
+    return {
+        "state": state["state_code"],
+        "state_name": state["state_name"],
+        "next_primary": state["next_primary"]["date"],
+        "primary_days_until": None,
+        "next_general": state["next_general"]["date"],
+        "general_days_until": None,
+        "confidence_level": state["next_primary"]["confidence"],
+        "sources": {
+            "statute": state["sources"][0]["reference"] if state["sources"] else None,
+            "statute_url": state["sources"][0]["url"] if state["sources"] else None,
+            "sos_url": state["sources"][1]["url"] if len(state["sources"]) > 1 else None,
+            "last_verified": state["last_updated"]
+        }
+    }
+
+def _build_election_sources(state: dict) -> dict:
+    """get_election_sources result for a state."""
+    return {
+        "state": state["state_code"],
+        "state_name": state["state_name"],
+        "primary_election": {
+            "date": state["next_primary"]["date"],
+            "date_rule": state["next_primary"]["date_rule"],
+            "statute_reference": state["next_primary"]["statute_reference"],
+            "confidence": state["next_primary"]["confidence"]
+        },
+        "general_election": {
+            "date": state["next_general"]["date"],
+            "date_rule": state["next_general"]["date_rule"],
+            "statute_reference": state["next_general"]["statute_reference"],
+            "confidence": state["next_general"]["confidence"]
+        },
+        "sources": state["sources"],
+        "validation": state["validation"],
+        "last_updated": state["last_updated"],
+        "notes": state["notes"]
+    }
+
+def _index_election_data(data: dict) -> None:
+    """Attach lookups and precomputed results to the election data.
+
+    Adds a state_code -> state lookup, each state's parsed primary/general
+    dates and its prebuilt get_next_election/get_election_sources results,
+    and the states sorted by each election date with parallel date lists for
+    bisecting range queries.
+    """
+    data["_by_code"] = {state["state_code"]: state for state in data["states"]}
+    for state in data["states"]:
+        state["_primary_date"] = date.fromisoformat(state["next_primary"]["date"])
+        state["_general_date"] = date.fromisoformat(state["next_general"]["date"])
+        state["_next_election"] = _build_next_election(state)
+        state["_election_sources"] = _build_election_sources(state)
+
+    # States sorted by each election date, with parallel date lists for
+    # bisecting range queries
+    for kind in ("primary", "general"):
+        ordered = sorted(data["states"], key=itemgetter(f"_{kind}_date"))
+        data[f"_{kind}_sorted"] = ordered
+        data[f"_{kind}_sorted_dates"] = [state[f"_{kind}_date"] for state in ordered]
+
 def load_election_data() -> dict:
     """Load election dates from JSON file."""
-    with open(DATA_PATH, "r") as f:
-        return json.load(f)
+    return _load_json_cached(DATA_PATH, _index_election_data)
+
+def _index_special_elections(data: dict) -> None:
+    """Attach per-state buckets and parsed next dates to the special elections data.
+
+    Kept alongside the election list because the election dicts are returned
+    to clients as-is and must stay JSON-serializable.
+    """
+    by_state = defaultdict(list)
+    for e in data.get("special_elections", []):
+        by_state[e["state_code"]].append(e)
+    data["_by_state"] = dict(by_state)
+    # (next date, election) pairs sorted by date, with a parallel list of
+    # dates for bisecting range queries
+    data["_sorted"] = sorted(
+        ((date.fromisoformat(e["next_date"]), e)
+         for e in data.get("special_elections", [])
+         if e.get("next_date")),
+        key=lambda pair: pair[0]
+    )
+    data["_sorted_dates"] = [d for d, _ in data["_sorted"]]
 
 def load_special_elections() -> dict:
     """Load special elections from JSON file."""
     if not SPECIAL_DATA_PATH.exists():
-        return {"special_elections": [], "metadata": {}, "by_state": {}}
-    with open(SPECIAL_DATA_PATH, "r") as f:
-        return json.load(f)
+        data = {"special_elections": [], "metadata": {}, "by_state": {}}
+        _index_special_elections(data)
+        return data
+    return _load_json_cached(SPECIAL_DATA_PATH, _index_special_elections)
+
+def special_elections_between(special_data: dict, start: date, end: date) -> list:
+    """Return (date, election) pairs with start <= next date <= end, by date."""
+    dates = special_data["_sorted_dates"]
+    lo = bisect_left(dates, start)
+    hi = bisect_right(dates, end)
+    return special_data["_sorted"][lo:hi]
+
+# National EAVS total -> (section, field) summed across states
+EAVS_TOTAL_FIELDS = {
+    "total_registered": ("voter_registration", "total_registered"),
+    "total_active": ("voter_registration", "total_active"),
+    "total_inactive": ("voter_registration", "total_inactive"),
+    "total_ballots_cast": ("turnout", "total_ballots_cast"),
+    "total_mail_sent": ("mail_voting", "ballots_transmitted"),
+    "total_mail_returned": ("mail_voting", "ballots_returned"),
+    "total_polling_places": ("polling", "polling_places"),
+    "total_poll_workers": ("polling", "poll_workers"),
+}
+
+def _summarize_eavs(data: dict) -> None:
+    """Attach national totals across all states to the EAVS data."""
+    states = list(data.get("states", {}).values())
+
+    # One builtin sum() per column rather than a Python loop over every field
+    totals = {
+        key: sum(state.get(section, {}).get(field) or 0 for state in states)
+        for key, (section, field) in EAVS_TOTAL_FIELDS.items()
+    }
+    totals["states_reporting"] = len(states)
+
+    # Calculate national turnout percentage
+    if totals["total_registered"] > 0:
+        totals["national_turnout_percentage"] = round(
+            totals["total_ballots_cast"] / totals["total_registered"] * 100, 1
+        )
+
+    data["_national_summary"] = totals
 
 def load_eavs_data() -> dict:
     """Load EAVS (Election Administration and Voting Survey) data."""
     if not EAVS_DATA_PATH.exists():
-        return {"metadata": {}, "states": {}}
-    with open(EAVS_DATA_PATH, "r") as f:
-        return json.load(f)
+        data = {"metadata": {}, "states": {}}
+        _summarize_eavs(data)
+        return data
+    return _load_json_cached(EAVS_DATA_PATH, _summarize_eavs)
+
+def states_between(data: dict, kind: str, start: date, end: date) -> list:
+    """Return states whose next ``kind`` election falls in a range, by date.
+
+    ``kind`` is "primary" or "general"; both bounds are inclusive.
+    """
+    dates = data[f"_{kind}_sorted_dates"]
+    lo = bisect_left(dates, start)
+    hi = bisect_right(dates, end)
+    return data[f"_{kind}_sorted"][lo:hi]
 
 def get_state_by_code(data: dict, state_code: str) -> dict | None:
     """Find a state by its code."""
-    state_code = state_code.upper()
-    for state in data["states"]:
-        if state["state_code"] == state_code:
-            return state
-    return None
-
-def days_until(date_str: str) -> int:
-    """Calculate days until a given date."""
-    target = datetime.strptime(date_str, "%Y-%m-%d").date()
-    today = date.today()
-    return (target - today).days
+    return data["_by_code"].get(state_code.upper())
+
+@lru_cache(maxsize=1024)
+def _days_between(date_str: str, today: date) -> int:
+    """Days from ``today`` to an ISO date string (memoized)."""
+    return (date.fromisoformat(date_str) - today).days
+
+def days_until(date_str: str, today: date | None = None) -> int:
+    """Calculate days until a given date.
+
+    Pass ``today`` to reuse one date for a whole request.
+    """
+    # Keying on today's date invalidates cached results at midnight
+    return _days_between(date_str, today or date.today())
+
+# Tool results are read by MCP clients, so they are compact unless
+# ELECTION_DATES_PRETTY_JSON is set (handy when debugging by hand)
+PRETTY_JSON = bool(os.environ.get("ELECTION_DATES_PRETTY_JSON"))
+
+def _dumps(obj) -> str:
+    """Serialize a tool result as JSON, using orjson when installed."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if PRETTY_JSON:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+    if PRETTY_JSON:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(",", ":"))
 
 # Initialize MCP server
 server = Server("election-dates")
 
-@server.list_tools()
-async def list_tools():
-    """List available tools."""
-    return [
-        Tool(
-            name="get_next_election",
-            description="Get the next primary and general election dates for a specific state",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "state_code": {
-                        "type": "string",
-                        "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
-                    }
-                },
-                "required": ["state_code"]
-            }
-        ),
-        Tool(
-            name="get_elections_by_date_range",
-            description="Get all elections within a date range",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format"
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "End date in YYYY-MM-DD format"
-                    }
-                },
-                "required": ["start_date", "end_date"]
-            }
-        ),
-        Tool(
-            name="get_all_upcoming_elections",
-            description="Get all upcoming elections across all states, sorted by date",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="get_election_sources",
-            description="Get detailed source citations for a state's election dates",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "state_code": {
-                        "type": "string",
-                        "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
-                    }
-                },
-                "required": ["state_code"]
-            }
-        ),
-        # Special Elections Tools
-        Tool(
-            name="get_special_elections_by_state",
-            description="Get all special elections for a specific state",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "state_code": {
-                        "type": "string",
-                        "description": "Two-letter state code (e.g., 'TX', 'GA', 'OH')"
-                    }
-                },
-                "required": ["state_code"]
-            }
-        ),
-        Tool(
-            name="get_upcoming_special_elections",
-            description="Get all upcoming special elections within a specified number of days",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "days_ahead": {
-                        "type": "integer",
-                        "description": "Number of days to look ahead (default: 90)"
-                    }
-                },
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_election_with_specials",
-            description="Get regular elections AND special elections combined for a specific state",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "state_code": {
-                        "type": "string",
-                        "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
-                    }
-                },
-                "required": ["state_code"]
-            }
-        ),
-        Tool(
-            name="get_all_elections_by_date_range",
-            description="Get all regular and special elections within a date range",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "start_date": {
-                        "type": "string",
-                        "description": "Start date in YYYY-MM-DD format"
-                    },
-                    "end_date": {
-                        "type": "string",
-                        "description": "End date in YYYY-MM-DD format"
-                    },
-                    "include_specials": {
-                        "type": "boolean",
-                        "description": "Include special elections (default: true)"
-                    }
+# Tool definitions are static, so build them once at import
+_TOOLS = [
+    Tool(
+        name="get_next_election",
+        description="Get the next primary and general election dates for a specific state",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "state_code": {
+                    "type": "string",
+                    "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
+                }
+            },
+            "required": ["state_code"]
+        }
+    ),
+    Tool(
+        name="get_elections_by_date_range",
+        description="Get all elections within a date range",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format"
                 },
-                "required": ["start_date", "end_date"]
-            }
-        ),
-        Tool(
-            name="get_special_elections_metadata",
-            description="Get metadata about the special elections dataset",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        # EAVS (Election Administration and Voting Survey) Tools
-        Tool(
-            name="get_eavs_data_for_state",
-            description="Get 2024 EAVS election administration statistics for a specific state (registered voters, turnout, mail voting, polling places, poll workers, provisional ballots)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "state_code": {
-                        "type": "string",
-                        "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
-                    }
+                "end_date": {
+                    "type": "string",
+                    "description": "End date in YYYY-MM-DD format"
+                }
+            },
+            "required": ["start_date", "end_date"]
+        }
+    ),
+    Tool(
+        name="get_all_upcoming_elections",
+        description="Get all upcoming elections across all states, sorted by date",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="get_election_sources",
+        description="Get detailed source citations for a state's election dates",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "state_code": {
+                    "type": "string",
+                    "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
+                }
+            },
+            "required": ["state_code"]
+        }
+    ),
+    # Special Elections Tools
+    Tool(
+        name="get_special_elections_by_state",
+        description="Get all special elections for a specific state",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "state_code": {
+                    "type": "string",
+                    "description": "Two-letter state code (e.g., 'TX', 'GA', 'OH')"
+                }
+            },
+            "required": ["state_code"]
+        }
+    ),
+    Tool(
+        name="get_upcoming_special_elections",
+        description="Get all upcoming special elections within a specified number of days",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "days_ahead": {
+                    "type": "integer",
+                    "description": "Number of days to look ahead (default: 90)"
+                }
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_election_with_specials",
+        description="Get regular elections AND special elections combined for a specific state",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "state_code": {
+                    "type": "string",
+                    "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
+                }
+            },
+            "required": ["state_code"]
+        }
+    ),
+    Tool(
+        name="get_all_elections_by_date_range",
+        description="Get all regular and special elections within a date range",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "start_date": {
+                    "type": "string",
+                    "description": "Start date in YYYY-MM-DD format"
                 },
-                "required": ["state_code"]
-            }
-        ),
-        Tool(
-            name="get_state_eavs_comparison",
-            description="Compare EAVS election administration statistics between multiple states",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "state_codes": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of two-letter state codes to compare (e.g., ['MI', 'CA', 'TX'])"
-                    }
+                "end_date": {
+                    "type": "string",
+                    "description": "End date in YYYY-MM-DD format"
                 },
-                "required": ["state_codes"]
-            }
-        ),
-        Tool(
-            name="get_national_eavs_summary",
-            description="Get national summary of 2024 EAVS data across all states (total registered voters, ballots cast, mail voting statistics)",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-    ]
-
-@server.call_tool()
-async def call_tool(name: str, arguments: dict):
-    """Handle tool calls."""
-    data = load_election_data()
-
-    if name == "get_next_election":
-        state_code = arguments.get("state_code", "").upper()
-        state = get_state_by_code(data, state_code)
-
-        if not state:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": f"State '{state_code}' not found"}, indent=2)
-            )]
-
-        result = {
-            "state": state["state_code"],
-            "state_name": state["state_name"],
-            "next_primary": state["next_primary"]["date"],
-            "primary_days_until": days_until(state["next_primary"]["date"]),
-            "next_general": state["next_general"]["date"],
-            "general_days_until": days_until(state["next_general"]["date"]),
-            "confidence_level": state["next_primary"]["confidence"],
-            "sources": {
-                "statute": state["sources"][0]["reference"] if state["sources"] else None,
-                "statute_url": state["sources"][0]["url"] if state["sources"] else None,
-                "sos_url": state["sources"][1]["url"] if len(state["sources"]) > 1 else None,
-                "last_verified": state["last_updated"]
-            }
+                "include_specials": {
+                    "type": "boolean",
+                    "description": "Include special elections (default: true)"
+                }
+            },
+            "required": ["start_date", "end_date"]
         }
+    ),
+    Tool(
+        name="get_special_elections_metadata",
+        description="Get metadata about the special elections dataset",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    # EAVS (Election Administration and Voting Survey) Tools
+    Tool(
+        name="get_eavs_data_for_state",
+        description="Get 2024 EAVS election administration statistics for a specific state (registered voters, turnout, mail voting, polling places, poll workers, provisional ballots)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "state_code": {
+                    "type": "string",
+                    "description": "Two-letter state code (e.g., 'MI', 'CA', 'TX')"
+                }
+            },
+            "required": ["state_code"]
+        }
+    ),
+    Tool(
+        name="get_state_eavs_comparison",
+        description="Compare EAVS election administration statistics between multiple states",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "state_codes": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of two-letter state codes to compare (e.g., ['MI', 'CA', 'TX'])"
+                }
+            },
+            "required": ["state_codes"]
+        }
+    ),
+    Tool(
+        name="get_national_eavs_summary",
+        description="Get national summary of 2024 EAVS data across all states (total registered voters, ballots cast, mail voting statistics)",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+]
 
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
-
-    elif name == "get_elections_by_date_range":
-        start_date = arguments.get("start_date")
-        end_date = arguments.get("end_date")
+@server.list_tools()
+async def list_tools():
+    """List available tools."""
+    return _TOOLS
 
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d").date()
-            end = datetime.strptime(end_date, "%Y-%m-%d").date()
-        except ValueError as e:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": f"Invalid date format: {e}"}, indent=2)
-            )]
-
-        elections = []
-        for state in data["states"]:
-            primary_date = datetime.strptime(state["next_primary"]["date"], "%Y-%m-%d").date()
-            general_date = datetime.strptime(state["next_general"]["date"], "%Y-%m-%d").date()
-
-            if start <= primary_date <= end:
-                elections.append({
-                    "state": state["state_code"],
-                    "state_name": state["state_name"],
-                    "date": state["next_primary"]["date"],
-                    "type": "primary",
-                    "days_until": days_until(state["next_primary"]["date"])
-                })
-
-            if start <= general_date <= end:
-                elections.append({
-                    "state": state["state_code"],
-                    "state_name": state["state_name"],
-                    "date": state["next_general"]["date"],
-                    "type": "general",
-                    "days_until": days_until(state["next_general"]["date"])
-                })
-
-        # Sort by date
-        elections.sort(key=lambda x: x["date"])
+# Regular Elections Handlers
+async def _handle_get_next_election(arguments: dict, today: date):
+    """Next primary and general election dates for one state."""
+    data = load_election_data()
+    state_code = arguments.get("state_code", "").upper()
+    state = get_state_by_code(data, state_code)
 
+    if not state:
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "date_range": {"start": start_date, "end": end_date},
-                "elections_count": len(elections),
-                "elections": elections
-            }, indent=2)
+            text=_dumps({"error": f"State '{state_code}' not found"})
         )]
 
-    elif name == "get_all_upcoming_elections":
-        elections = []
-        for state in data["states"]:
-            elections.append({
-                "state": state["state_code"],
-                "state_name": state["state_name"],
-                "date": state["next_primary"]["date"],
-                "type": "primary",
-                "days_until": days_until(state["next_primary"]["date"])
-            })
-            elections.append({
-                "state": state["state_code"],
-                "state_name": state["state_name"],
-                "date": state["next_general"]["date"],
-                "type": "general",
-                "days_until": days_until(state["next_general"]["date"])
-            })
+    # Only the day counts change between calls; they keep their key positions
+    result = {
+        **state["_next_election"],
+        "primary_days_until": days_until(state["next_primary"]["date"], today),
+        "general_days_until": days_until(state["next_general"]["date"], today),
+    }
+
+    return [TextContent(
+        type="text",
+        text=_dumps(result)
+    )]
 
-        # Sort by date
-        elections.sort(key=lambda x: x["date"])
+async def _handle_get_elections_by_date_range(arguments: dict, today: date):
+    """Regular elections falling within a date range."""
+    data = load_election_data()
+    start_date = arguments.get("start_date")
+    end_date = arguments.get("end_date")
 
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except ValueError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "total_elections": len(elections),
-                "data_updated": data["metadata"]["generated_at"][:10],
-                "elections": elections
-            }, indent=2)
+            text=_dumps({"error": f"Invalid date format: {e}"})
         )]
 
-    elif name == "get_election_sources":
-        state_code = arguments.get("state_code", "").upper()
-        state = get_state_by_code(data, state_code)
-
-        if not state:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": f"State '{state_code}' not found"}, indent=2)
-            )]
-
-        result = {
+    elections = []
+    for state in states_between(data, "primary", start, end):
+        elections.append((state["_primary_date"], {
             "state": state["state_code"],
             "state_name": state["state_name"],
-            "primary_election": {
-                "date": state["next_primary"]["date"],
-                "date_rule": state["next_primary"]["date_rule"],
-                "statute_reference": state["next_primary"]["statute_reference"],
-                "confidence": state["next_primary"]["confidence"]
-            },
-            "general_election": {
-                "date": state["next_general"]["date"],
-                "date_rule": state["next_general"]["date_rule"],
-                "statute_reference": state["next_general"]["statute_reference"],
-                "confidence": state["next_general"]["confidence"]
-            },
-            "sources": state["sources"],
-            "validation": state["validation"],
-            "last_updated": state["last_updated"],
-            "notes": state["notes"]
-        }
-
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
-
-    # Special Elections Handlers
-    elif name == "get_special_elections_by_state":
-        state_code = arguments.get("state_code", "").upper()
-        special_data = load_special_elections()
-
-        state_specials = [
-            e for e in special_data.get("special_elections", [])
-            if e["state_code"] == state_code
-        ]
+            "date": state["next_primary"]["date"],
+            "type": "primary",
+            "days_until": days_until(state["next_primary"]["date"], today)
+        }))
+    for state in states_between(data, "general", start, end):
+        elections.append((state["_general_date"], {
+            "state": state["state_code"],
+            "state_name": state["state_name"],
+            "date": state["next_general"]["date"],
+            "type": "general",
+            "days_until": days_until(state["next_general"]["date"], today)
+        }))
+
+    # Sort by the precomputed date keys, then drop them
+    elections.sort(key=itemgetter(0))
+    elections = [e for _, e in elections]
+
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "date_range": {"start": start_date, "end": end_date},
+            "elections_count": len(elections),
+            "elections": elections
+        })
+    )]
+
+async def _handle_get_all_upcoming_elections(arguments: dict, today: date):
+    """All regular elections across states, sorted by date."""
+    data = load_election_data()
+    elections = []
+    for state in data["states"]:
+        elections.append((state["_primary_date"], {
+            "state": state["state_code"],
+            "state_name": state["state_name"],
+            "date": state["next_primary"]["date"],
+            "type": "primary",
+            "days_until": days_until(state["next_primary"]["date"], today)
+        }))
+        elections.append((state["_general_date"], {
+            "state": state["state_code"],
+            "state_name": state["state_name"],
+            "date": state["next_general"]["date"],
+            "type": "general",
+            "days_until": days_until(state["next_general"]["date"], today)
+        }))
+
+    # Sort by the precomputed date keys, then drop them
+    elections.sort(key=itemgetter(0))
+    elections = [e for _, e in elections]
+
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "total_elections": len(elections),
+            "data_updated": data["metadata"]["generated_at"][:10],
+            "elections": elections
+        })
+    )]
+
+async def _handle_get_election_sources(arguments: dict, today: date):
+    """Source citations for a state's election dates."""
+    data = load_election_data()
+    state_code = arguments.get("state_code", "").upper()
+    state = get_state_by_code(data, state_code)
 
+    if not state:
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "state_code": state_code,
-                "special_elections_count": len(state_specials),
-                "special_elections": state_specials
-            }, indent=2)
+            text=_dumps({"error": f"State '{state_code}' not found"})
         )]
 
-    elif name == "get_upcoming_special_elections":
-        days_ahead = arguments.get("days_ahead", 90)
-        special_data = load_special_elections()
-        today = date.today()
-
-        upcoming = []
-        for election in special_data.get("special_elections", []):
-            next_date = election.get("next_date")
-            if next_date:
-                election_date = datetime.strptime(next_date, "%Y-%m-%d").date()
-                days_diff = (election_date - today).days
-                if 0 <= days_diff <= days_ahead:
-                    upcoming.append({
-                        **election,
-                        "days_until": days_diff
-                    })
-
-        # Sort by date
-        upcoming.sort(key=lambda x: x.get("next_date", ""))
-
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "days_ahead": days_ahead,
-                "count": len(upcoming),
-                "special_elections": upcoming
-            }, indent=2)
-        )]
+    result = state["_election_sources"]
 
-    elif name == "get_election_with_specials":
-        state_code = arguments.get("state_code", "").upper()
-        state = get_state_by_code(data, state_code)
-        special_data = load_special_elections()
+    return [TextContent(
+        type="text",
+        text=_dumps(result)
+    )]
 
-        if not state:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": f"State '{state_code}' not found"}, indent=2)
-            )]
+# Special Elections Handlers
+async def _handle_get_special_elections_by_state(arguments: dict, today: date):
+    """All special elections for one state."""
+    state_code = arguments.get("state_code", "").upper()
+    special_data = load_special_elections()
 
-        state_specials = [
-            e for e in special_data.get("special_elections", [])
-            if e["state_code"] == state_code
-        ]
+    state_specials = special_data["_by_state"].get(state_code, [])
 
-        result = {
-            "state": state["state_code"],
-            "state_name": state["state_name"],
-            "regular_elections": {
-                "next_primary": {
-                    "date": state["next_primary"]["date"],
-                    "days_until": days_until(state["next_primary"]["date"])
-                },
-                "next_general": {
-                    "date": state["next_general"]["date"],
-                    "days_until": days_until(state["next_general"]["date"])
-                }
-            },
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "state_code": state_code,
             "special_elections_count": len(state_specials),
             "special_elections": state_specials
-        }
-
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2)
-        )]
-
-    elif name == "get_all_elections_by_date_range":
-        start_date = arguments.get("start_date")
-        end_date = arguments.get("end_date")
-        include_specials = arguments.get("include_specials", True)
-
-        try:
-            start = datetime.strptime(start_date, "%Y-%m-%d").date()
-            end = datetime.strptime(end_date, "%Y-%m-%d").date()
-        except ValueError as e:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": f"Invalid date format: {e}"}, indent=2)
-            )]
-
-        elections = []
-
-        # Regular elections
-        for state in data["states"]:
-            primary_date = datetime.strptime(state["next_primary"]["date"], "%Y-%m-%d").date()
-            general_date = datetime.strptime(state["next_general"]["date"], "%Y-%m-%d").date()
-
-            if start <= primary_date <= end:
-                elections.append({
-                    "state": state["state_code"],
-                    "state_name": state["state_name"],
-                    "date": state["next_primary"]["date"],
-                    "type": "primary",
-                    "category": "regular",
-                    "days_until": days_until(state["next_primary"]["date"])
-                })
-
-            if start <= general_date <= end:
-                elections.append({
-                    "state": state["state_code"],
-                    "state_name": state["state_name"],
-                    "date": state["next_general"]["date"],
-                    "type": "general",
-                    "category": "regular",
-                    "days_until": days_until(state["next_general"]["date"])
-                })
-
-        # Special elections
-        if include_specials:
-            special_data = load_special_elections()
-            for election in special_data.get("special_elections", []):
-                next_date = election.get("next_date")
-                if next_date:
-                    election_date = datetime.strptime(next_date, "%Y-%m-%d").date()
-                    if start <= election_date <= end:
-                        elections.append({
-                            "state": election["state_code"],
-                            "state_name": election["state_name"],
-                            "date": next_date,
-                            "type": election["next_date_type"],
-                            "category": "special",
-                            "office": election["office"],
-                            "district": election["district"],
-                            "days_until": (election_date - date.today()).days
-                        })
-
-        # Sort by date
-        elections.sort(key=lambda x: x["date"])
-
-        return [TextContent(
-            type="text",
-            text=json.dumps({
-                "date_range": {"start": start_date, "end": end_date},
-                "include_specials": include_specials,
-                "elections_count": len(elections),
-                "elections": elections
-            }, indent=2)
-        )]
+        })
+    )]
+
+async def _handle_get_upcoming_special_elections(arguments: dict, today: date):
+    """Special elections within the next ``days_ahead`` days."""
+    days_ahead = arguments.get("days_ahead", 90)
+    special_data = load_special_elections()
+    try:
+        end = today + timedelta(days=days_ahead)
+    except OverflowError:
+        # Window runs past the calendar; clamp instead of failing the call
+        end = date.max if days_ahead > 0 else date.min
+    # Already in date order from the index
+    upcoming = [
+        {**election, "days_until": (election_date - today).days}
+        for election_date, election in special_elections_between(
+            special_data, today, end
+        )
+    ]
 
-    elif name == "get_special_elections_metadata":
-        special_data = load_special_elections()
-        metadata = special_data.get("metadata", {})
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "days_ahead": days_ahead,
+            "count": len(upcoming),
+            "special_elections": upcoming
+        })
+    )]
+
+async def _handle_get_election_with_specials(arguments: dict, today: date):
+    """Regular and special elections combined for one state."""
+    data = load_election_data()
+    state_code = arguments.get("state_code", "").upper()
+    state = get_state_by_code(data, state_code)
+    special_data = load_special_elections()
 
+    if not state:
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "metadata": metadata,
-                "states_with_specials": list(special_data.get("by_state", {}).keys())
-            }, indent=2)
+            text=_dumps({"error": f"State '{state_code}' not found"})
         )]
 
-    # EAVS Tool Handlers
-    elif name == "get_eavs_data_for_state":
-        state_code = arguments.get("state_code", "").upper()
-        eavs_data = load_eavs_data()
-        state_eavs = eavs_data.get("states", {}).get(state_code)
-
-        if not state_eavs:
-            return [TextContent(
-                type="text",
-                text=json.dumps({"error": f"EAVS data not available for state '{state_code}'"}, indent=2)
-            )]
+    state_specials = special_data["_by_state"].get(state_code, [])
 
+    result = {
+        "state": state["state_code"],
+        "state_name": state["state_name"],
+        "regular_elections": {
+            "next_primary": {
+                "date": state["next_primary"]["date"],
+                "days_until": days_until(state["next_primary"]["date"], today)
+            },
+            "next_general": {
+                "date": state["next_general"]["date"],
+                "days_until": days_until(state["next_general"]["date"], today)
+            }
+        },
+        "special_elections_count": len(state_specials),
+        "special_elections": state_specials
+    }
+
+    return [TextContent(
+        type="text",
+        text=_dumps(result)
+    )]
+
+async def _handle_get_all_elections_by_date_range(arguments: dict, today: date):
+    """Regular and special elections within a date range."""
+    data = load_election_data()
+    start_date = arguments.get("start_date")
+    end_date = arguments.get("end_date")
+    include_specials = arguments.get("include_specials", True)
+
+    try:
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+    except ValueError as e:
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "state_code": state_code,
-                "state_name": state_eavs.get("state_name"),
-                "jurisdiction_count": state_eavs.get("jurisdiction_count"),
-                "voter_registration": state_eavs.get("voter_registration"),
-                "turnout": state_eavs.get("turnout"),
-                "mail_voting": state_eavs.get("mail_voting"),
-                "polling": state_eavs.get("polling"),
-                "provisional": state_eavs.get("provisional"),
-                "source": eavs_data.get("metadata", {})
-            }, indent=2)
+            text=_dumps({"error": f"Invalid date format: {e}"})
         )]
 
-    elif name == "get_state_eavs_comparison":
-        state_codes = [s.upper() for s in arguments.get("state_codes", [])]
-        eavs_data = load_eavs_data()
-        states_data = eavs_data.get("states", {})
-
-        comparison = []
-        for code in state_codes:
-            state_eavs = states_data.get(code)
-            if state_eavs:
-                comparison.append({
-                    "state_code": code,
-                    "state_name": state_eavs.get("state_name"),
-                    "registered_voters": state_eavs.get("voter_registration", {}).get("total_registered"),
-                    "ballots_cast": state_eavs.get("turnout", {}).get("total_ballots_cast"),
-                    "turnout_percentage": state_eavs.get("turnout", {}).get("turnout_percentage"),
-                    "polling_places": state_eavs.get("polling", {}).get("polling_places"),
-                    "poll_workers": state_eavs.get("polling", {}).get("poll_workers"),
-                    "mail_ballots_sent": state_eavs.get("mail_voting", {}).get("ballots_transmitted"),
-                    "mail_return_rate": state_eavs.get("mail_voting", {}).get("return_rate"),
-                })
+    elections = []
 
+    # Regular elections
+    for state in states_between(data, "primary", start, end):
+        elections.append((state["_primary_date"], {
+            "state": state["state_code"],
+            "state_name": state["state_name"],
+            "date": state["next_primary"]["date"],
+            "type": "primary",
+            "category": "regular",
+            "days_until": days_until(state["next_primary"]["date"], today)
+        }))
+    for state in states_between(data, "general", start, end):
+        elections.append((state["_general_date"], {
+            "state": state["state_code"],
+            "state_name": state["state_name"],
+            "date": state["next_general"]["date"],
+            "type": "general",
+            "category": "regular",
+            "days_until": days_until(state["next_general"]["date"], today)
+        }))
+
+    # Special elections
+    if include_specials:
+        special_data = load_special_elections()
+        for election_date, election in special_elections_between(special_data, start, end):
+            elections.append((election_date, {
+                "state": election["state_code"],
+                "state_name": election["state_name"],
+                "date": election["next_date"],
+                "type": election["next_date_type"],
+                "category": "special",
+                "office": election["office"],
+                "district": election["district"],
+                "days_until": (election_date - today).days
+            }))
+
+    # Sort by the precomputed date keys, then drop them
+    elections.sort(key=itemgetter(0))
+    elections = [e for _, e in elections]
+
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "date_range": {"start": start_date, "end": end_date},
+            "include_specials": include_specials,
+            "elections_count": len(elections),
+            "elections": elections
+        })
+    )]
+
+async def _handle_get_special_elections_metadata(arguments: dict, today: date):
+    """Metadata about the special elections dataset."""
+    special_data = load_special_elections()
+    metadata = special_data.get("metadata", {})
+
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "metadata": metadata,
+            "states_with_specials": list(special_data.get("by_state", {}).keys())
+        })
+    )]
+
+# EAVS Tool Handlers
+async def _handle_get_eavs_data_for_state(arguments: dict, today: date):
+    """EAVS statistics for one state."""
+    state_code = arguments.get("state_code", "").upper()
+    eavs_data = load_eavs_data()
+    state_eavs = eavs_data.get("states", {}).get(state_code)
+
+    if not state_eavs:
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "states_compared": len(comparison),
-                "comparison": comparison
-            }, indent=2)
+            text=_dumps({"error": f"EAVS data not available for state '{state_code}'"})
         )]
 
-    elif name == "get_national_eavs_summary":
-        eavs_data = load_eavs_data()
-        states_data = eavs_data.get("states", {})
-
-        totals = {
-            "total_registered": 0,
-            "total_active": 0,
-            "total_inactive": 0,
-            "total_ballots_cast": 0,
-            "total_mail_sent": 0,
-            "total_mail_returned": 0,
-            "total_polling_places": 0,
-            "total_poll_workers": 0,
-            "states_reporting": 0,
-        }
-
-        for code, state_eavs in states_data.items():
-            totals["states_reporting"] += 1
-            vr = state_eavs.get("voter_registration", {})
-            totals["total_registered"] += vr.get("total_registered") or 0
-            totals["total_active"] += vr.get("total_active") or 0
-            totals["total_inactive"] += vr.get("total_inactive") or 0
-
-            turnout = state_eavs.get("turnout", {})
-            totals["total_ballots_cast"] += turnout.get("total_ballots_cast") or 0
-
-            mail = state_eavs.get("mail_voting", {})
-            totals["total_mail_sent"] += mail.get("ballots_transmitted") or 0
-            totals["total_mail_returned"] += mail.get("ballots_returned") or 0
-
-            polling = state_eavs.get("polling", {})
-            totals["total_polling_places"] += polling.get("polling_places") or 0
-            totals["total_poll_workers"] += polling.get("poll_workers") or 0
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "state_code": state_code,
+            "state_name": state_eavs.get("state_name"),
+            "jurisdiction_count": state_eavs.get("jurisdiction_count"),
+            "voter_registration": state_eavs.get("voter_registration"),
+            "turnout": state_eavs.get("turnout"),
+            "mail_voting": state_eavs.get("mail_voting"),
+            "polling": state_eavs.get("polling"),
+            "provisional": state_eavs.get("provisional"),
+            "source": eavs_data.get("metadata", {})
+        })
+    )]
+
+async def _handle_get_state_eavs_comparison(arguments: dict, today: date):
+    """Side-by-side EAVS statistics for several states."""
+    state_codes = [s.upper() for s in arguments.get("state_codes", [])]
+    eavs_data = load_eavs_data()
+    states_data = eavs_data.get("states", {})
+
+    comparison = []
+    for code in state_codes:
+        state_eavs = states_data.get(code)
+        if state_eavs:
+            comparison.append({
+                "state_code": code,
+                "state_name": state_eavs.get("state_name"),
+                "registered_voters": state_eavs.get("voter_registration", {}).get("total_registered"),
+                "ballots_cast": state_eavs.get("turnout", {}).get("total_ballots_cast"),
+                "turnout_percentage": state_eavs.get("turnout", {}).get("turnout_percentage"),
+                "polling_places": state_eavs.get("polling", {}).get("polling_places"),
+                "poll_workers": state_eavs.get("polling", {}).get("poll_workers"),
+                "mail_ballots_sent": state_eavs.get("mail_voting", {}).get("ballots_transmitted"),
+                "mail_return_rate": state_eavs.get("mail_voting", {}).get("return_rate"),
+            })
 
-        # Calculate national turnout percentage
-        if totals["total_registered"] > 0:
-            totals["national_turnout_percentage"] = round(
-                totals["total_ballots_cast"] / totals["total_registered"] * 100, 1
-            )
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "states_compared": len(comparison),
+            "comparison": comparison
+        })
+    )]
+
+async def _handle_get_national_eavs_summary(arguments: dict, today: date):
+    """National EAVS totals across all states."""
+    eavs_data = load_eavs_data()
+
+    return [TextContent(
+        type="text",
+        text=_dumps({
+            "national_summary": eavs_data["_national_summary"],
+            "source": eavs_data.get("metadata", {})
+        })
+    )]
+
+# Tool name -> handler coroutine
+_HANDLERS = {
+    "get_next_election": _handle_get_next_election,
+    "get_elections_by_date_range": _handle_get_elections_by_date_range,
+    "get_all_upcoming_elections": _handle_get_all_upcoming_elections,
+    "get_election_sources": _handle_get_election_sources,
+    "get_special_elections_by_state": _handle_get_special_elections_by_state,
+    "get_upcoming_special_elections": _handle_get_upcoming_special_elections,
+    "get_election_with_specials": _handle_get_election_with_specials,
+    "get_all_elections_by_date_range": _handle_get_all_elections_by_date_range,
+    "get_special_elections_metadata": _handle_get_special_elections_metadata,
+    "get_eavs_data_for_state": _handle_get_eavs_data_for_state,
+    "get_state_eavs_comparison": _handle_get_state_eavs_comparison,
+    "get_national_eavs_summary": _handle_get_national_eavs_summary,
+}
 
+@server.call_tool()
+async def call_tool(name: str, arguments: dict):
+    """Handle tool calls."""
+    handler = _HANDLERS.get(name)
+    if handler is None:
         return [TextContent(
             type="text",
-            text=json.dumps({
-                "national_summary": totals,
-                "source": eavs_data.get("metadata", {})
-            }, indent=2)
+            text=_dumps({"error": f"Unknown tool: {name}"})
         )]
 
-    else:
-        return [TextContent(
-            type="text",
-            text=json.dumps({"error": f"Unknown tool: {name}"}, indent=2)
-        )]
+    return await handler(arguments, date.today())
 
 async def main():
     """Run the MCP server."""
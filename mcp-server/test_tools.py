@@ -11,7 +11,12 @@ from pathlib import Path
 import sys
 sys.path.insert(0, str(Path(__file__).parent))
 
-from server import load_election_data, get_state_by_code, days_until
+from datetime import date
+
+from server import (
+    load_election_data, load_special_elections, get_state_by_code, days_until,
+    special_elections_between, _handle_get_upcoming_special_elections,
+)
 
 def test_load_data():
     """Test loading election data."""
@@ -20,6 +25,9 @@ def test_load_data():
     assert "states" in data
     assert "metadata" in data
     print(f"  Loaded {len(data['states'])} states")
+
+    # Repeated loads are served from the cache
+    assert load_election_data() is data
     print("  OK")
 
 def test_get_state():
@@ -54,6 +62,38 @@ def test_days_until():
     assert days > 0
     print("  OK")
 
+def test_special_elections_between():
+    """Test the date-sorted special elections range lookup."""
+    print("\nTesting special_elections_between()...")
+    special_data = load_special_elections()
+    start, end = date(2025, 1, 1), date(2027, 12, 31)
+
+    found = special_elections_between(special_data, start, end)
+    expected = [
+        e for e in special_data["special_elections"]
+        if e.get("next_date") and start <= date.fromisoformat(e["next_date"]) <= end
+    ]
+    assert sorted(e["id"] for _, e in found) == sorted(e["id"] for e in expected)
+    assert [d for d, _ in found] == sorted(d for d, _ in found)
+    print(f"  {len(found)} special elections between {start} and {end}")
+
+    # Empty window
+    assert special_elections_between(special_data, end, start) == []
+    print("  OK")
+
+def test_upcoming_special_elections_huge_window():
+    """A days_ahead past the end of the calendar clamps rather than overflowing."""
+    print("\nTesting get_upcoming_special_elections with a huge window...")
+    today = date(2026, 1, 15)
+    for days_ahead in (10_000_000, -10_000_000):
+        result = asyncio.run(_handle_get_upcoming_special_elections(
+            {"days_ahead": days_ahead}, today
+        ))
+        payload = json.loads(result[0].text)
+        assert payload["days_ahead"] == days_ahead
+        assert payload["count"] == len(payload["special_elections"])
+    print("  OK")
+
 def test_tool_outputs():
     """Test the expected tool outputs."""
     print("\nTesting tool output formats...")
@@ -101,6 +141,8 @@ def main():
     test_load_data()
     test_get_state()
     test_days_until()
+    test_special_elections_between()
+    test_upcoming_special_elections_huge_window()
     test_tool_outputs()
 
     print("\n" + "=" * 60)
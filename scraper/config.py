@@ -3,8 +3,25 @@ State SOS website configuration for election date scraping.
 Each state has different page structures, so we define custom extraction logic.
 """
 
+import json
+import os
+import shutil
+from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# On-disk HTTP cache shared by the scrapers (when requests-cache is
+# installed); SOS calendars change rarely, so reruns within a few hours are
+# served locally
+HTTP_CACHE_PATH = Path(__file__).parent / "http_cache"
+HTTP_CACHE_EXPIRE = 6 * 60 * 60
+
 # 2026 Election dates (verified from NCSL and official sources)
-KNOWN_2026_DATES = {
+KNOWN_2026_DATES = MappingProxyType({
     "AL": {"primary": "2026-05-19", "general": "2026-11-03"},
     "AK": {"primary": "2026-08-18", "general": "2026-11-03"},
     "AZ": {"primary": "2026-08-04", "general": "2026-11-03"},
@@ -55,19 +72,19 @@ KNOWN_2026_DATES = {
     "WV": {"primary": "2026-05-12", "general": "2026-11-03"},
     "WI": {"primary": "2026-08-11", "general": "2026-11-03"},
     "WY": {"primary": "2026-08-18", "general": "2026-11-03"},
-}
+})
 
 # All 50 state codes
-ALL_STATES = [
+ALL_STATES = (
     "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "FL", "GA",
     "HI", "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD",
     "MA", "MI", "MN", "MS", "MO", "MT", "NE", "NV", "NH", "NJ",
     "NM", "NY", "NC", "ND", "OH", "OK", "OR", "PA", "RI", "SC",
     "SD", "TN", "TX", "UT", "VT", "VA", "WA", "WV", "WI", "WY",
-]
+)
 
 # State code to full name mapping
-STATE_NAMES = {
+STATE_NAMES = MappingProxyType({
     "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas",
     "CA": "California", "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware",
     "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho",
@@ -81,4 +98,82 @@ STATE_NAMES = {
     "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah",
     "VT": "Vermont", "VA": "Virginia", "WA": "Washington", "WV": "West Virginia",
     "WI": "Wisconsin", "WY": "Wyoming",
-}
+})
+
+
+def write_json(path, obj, compact=False):
+    """Write obj to path as JSON: indented, or compact for the copies only
+    read by programs (the MCP server and website).
+
+    Uses orjson when installed; without it, json.dump streams the encoder's
+    chunks through a 1 MiB buffer instead of building the whole string. The
+    file is staged next to path and swapped in with os.replace, which also
+    leaves alone any file a previous run hardlinked to path.
+    """
+    path = os.fspath(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    if orjson is not None:
+        with open(tmp, "wb") as f:
+            f.write(orjson.dumps(obj, option=0 if compact else orjson.OPT_INDENT_2))
+    else:
+        with open(tmp, "w", encoding="utf-8", buffering=1 << 20) as f:
+            if compact:
+                json.dump(obj, f, separators=(",", ":"))
+            else:
+                json.dump(obj, f, indent=2)
+    os.replace(tmp, path)
+
+
+def link_or_copy(src, dst):
+    """Point dst at src's bytes: hardlink when possible, copy otherwise.
+
+    The new file is staged next to dst and swapped in with os.replace, so an
+    existing dst is never left half-written.
+    """
+    dst = os.fspath(dst)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        # Cross-device or no hardlink support
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def make_session(max_workers, retries=None):
+    """Build the HTTP session a scraper shares across its fetch threads.
+
+    Uses a requests-cache CachedSession over HTTP_CACHE_PATH when installed,
+    else a plain requests.Session. The connection pool is sized to
+    max_workers so concurrent fetches to one host reuse pooled connections;
+    retries, if given, is the number of retries with backoff per request.
+    """
+    # Imported here so the validators, which only use the tables and JSON
+    # helpers above, don't load requests
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    try:
+        import requests_cache
+    except ImportError:
+        requests_cache = None
+
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            str(HTTP_CACHE_PATH), backend="sqlite",
+            expire_after=HTTP_CACHE_EXPIRE, stale_if_error=True,
+        )
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=max_workers,
+        pool_maxsize=max_workers,
+        max_retries=Retry(total=retries, backoff_factor=0.5) if retries else 0,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
@@ -11,25 +11,71 @@ import json
 import os
 from collections import defaultdict
 
-# Special values in EAVS data
-SPECIAL_VALUES = {-88, -99, -77, '-88', '-99', '-77', 'DNA (DATA NOT AVAILABLE)', ''}
+from config import link_or_copy, write_json
+
+# Special values in EAVS data: -77, -88, -99 and 'DNA (DATA NOT AVAILABLE)'.
+# safe_int maps them to None: the numeric codes are caught by the negative
+# check and the text code fails to parse.
 
 def safe_int(val):
     """Safely convert to int, handling special EAVS values"""
-    if val in SPECIAL_VALUES or val is None:
+    if val is None or val == '':
         return None
     try:
-        num = int(float(val))
-        # Negative numbers are special codes
-        if num < 0:
+        # Fast path: plain integer strings
+        num = int(val)
+    except ValueError:
+        try:
+            num = int(float(val))
+        except (ValueError, OverflowError):
             return None
-        return num
-    except (ValueError, TypeError):
+    except TypeError:
         return None
-
-def aggregate_state_data(rows):
+    # Negative numbers are special codes
+    if num < 0:
+        return None
+    return num
+
+# EAVS column -> (section, key) summed into each state, per EAC Report mapping
+EAVS_FIELDS = (
+    # Voter Registration (Section A)
+    # A1a = Total registered (some states report combined), so we sum A1b + A1c
+    ('A1b', 'voter_registration', 'total_active'),      # Active per EAC
+    ('A1c', 'voter_registration', 'total_inactive'),    # Inactive per EAC
+    ('A2a', 'voter_registration', 'same_day_registrations'),
+    # Registration transactions (A3x columns)
+    # A3a = At motor vehicle offices, A3b = By mail, A3c = At public assistance
+    # offices, A3d = At other agencies, A3e = Registration drives, A3f = Online
+    ('A3a', 'registration_transactions', 'motor_vehicle'),
+    ('A3b', 'registration_transactions', 'by_mail'),
+    ('A3f', 'registration_transactions', 'online'),
+    # Mail Voting (Section C)
+    ('C1a', 'mail_voting', 'ballots_transmitted'),      # Total mail ballots transmitted
+    ('C2a', 'mail_voting', 'ballots_returned'),         # Returned by voters
+    ('C3a', 'mail_voting', 'ballots_rejected'),
+    ('C6a', 'mail_voting', 'ballots_counted'),
+    # UOCAVA (Section B - Military/Overseas)
+    ('B3a', 'uocava', 'ballots_transmitted'),
+    ('B4a', 'uocava', 'ballots_returned'),
+    # Polling Operations (Section D)
+    ('D1a', 'polling', 'precincts'),
+    ('D2a', 'polling', 'polling_places'),               # Physical polling places
+    ('D7a', 'polling', 'poll_workers'),                 # Total poll workers (per EAC Report, not D3a)
+    # Provisional Voting (Section E)
+    ('E1a', 'provisional', 'ballots_submitted'),
+    ('E2a', 'provisional', 'ballots_counted'),          # Counted in full
+    # Turnout (Section F)
+    ('F1a', 'turnout', 'total_ballots_cast'),           # Total ballots cast/counted
+)
+
+def aggregate_state_data(rows, header):
     """Aggregate jurisdiction-level data to state totals
 
+    `rows` is any iterable of csv.reader lists laid out per `header` (e.g. a
+    live reader); it is consumed once, so only the per-state totals are held
+    in memory. Columns are resolved to indexes once from the header.
+    Returns (states, row_count).
+
     Column mapping per EAC Report:
     - A1a = Total registered voters (active + inactive combined in some states)
     - A1b = Active registered voters
@@ -80,100 +126,43 @@ def aggregate_state_data(rows):
         },
     })
 
+    col = {name: i for i, name in enumerate(header)}
+    state_abbr_i = col['State_Abbr']
+    state_full_i = col['State_Full']
+    # Columns missing from this release are skipped, as row.get() would have
+    columns = [(col[name], section, key) for name, section, key in EAVS_FIELDS if name in col]
+    width = len(header)
+
+    # Hot-loop names bound to locals; each state's plan holds direct references
+    # to its section dicts so the inner loop skips the nested lookups
+    _safe_int = safe_int
+    plans = {}
+
+    row_count = 0
     for row in rows:
-        state_code = row.get('State_Abbr', '').strip()
+        if not row:
+            continue
+        row_count += 1
+        if len(row) < width:
+            row = row + [''] * (width - len(row))
+
+        state_code = row[state_abbr_i].strip()
         if not state_code:
             continue
 
         state = states[state_code]
         state['state_code'] = state_code
-        state['state_name'] = row.get('State_Full', '').strip()
+        state['state_name'] = row[state_full_i].strip()
         state['jurisdiction_count'] += 1
 
-        # Voter Registration (Section A) - per EAC Report column mapping
-        # A1a = Total registered (some states report combined)
-        # A1b = Active registered voters
-        # A1c = Inactive registered voters
-        val = safe_int(row.get('A1b'))  # A1b = Active per EAC
-        if val: state['voter_registration']['total_active'] += val
-
-        val = safe_int(row.get('A1c'))  # A1c = Inactive per EAC
-        if val: state['voter_registration']['total_inactive'] += val
-
-        # A2a = Same-day registrations
-        val = safe_int(row.get('A2a'))
-        if val: state['voter_registration']['same_day_registrations'] += val
-
-        # Registration transactions (A3x columns)
-        # A3a = At motor vehicle offices
-        # A3b = By mail
-        # A3c = At public assistance offices
-        # A3d = At other agencies
-        # A3e = Registration drives
-        # A3f = Online
-        val = safe_int(row.get('A3a'))
-        if val: state['registration_transactions']['motor_vehicle'] += val
-
-        val = safe_int(row.get('A3b'))
-        if val: state['registration_transactions']['by_mail'] += val
-
-        val = safe_int(row.get('A3f'))
-        if val: state['registration_transactions']['online'] += val
-
-        # Mail Voting (Section C)
-        # C1a = Total mail ballots transmitted
-        val = safe_int(row.get('C1a'))
-        if val: state['mail_voting']['ballots_transmitted'] += val
-
-        # C2a = Mail ballots returned by voters
-        val = safe_int(row.get('C2a'))
-        if val: state['mail_voting']['ballots_returned'] += val
-
-        # C3a = Mail ballots rejected
-        val = safe_int(row.get('C3a'))
-        if val: state['mail_voting']['ballots_rejected'] += val
-
-        # C6a = Mail ballots counted
-        val = safe_int(row.get('C6a'))
-        if val: state['mail_voting']['ballots_counted'] += val
-
-        # UOCAVA (Section B - Military/Overseas)
-        # B3a = UOCAVA ballots transmitted
-        val = safe_int(row.get('B3a'))
-        if val: state['uocava']['ballots_transmitted'] += val
-
-        # B4a = UOCAVA ballots returned
-        val = safe_int(row.get('B4a'))
-        if val: state['uocava']['ballots_returned'] += val
-
-        # Polling Operations (Section D)
-        # D1a = Number of precincts
-        val = safe_int(row.get('D1a'))
-        if val: state['polling']['precincts'] += val
-
-        # D2a = Number of physical polling places
-        val = safe_int(row.get('D2a'))
-        if val: state['polling']['polling_places'] += val
-
-        # D7a = Total poll workers (per EAC Report, not D3a)
-        val = safe_int(row.get('D7a'))
-        if val: state['polling']['poll_workers'] += val
-
-        # Provisional Voting (Section E)
-        # E1a = Provisional ballots submitted
-        val = safe_int(row.get('E1a'))
-        if val: state['provisional']['ballots_submitted'] += val
-
-        # E2a = Provisional ballots counted in full
-        val = safe_int(row.get('E2a'))
-        if val: state['provisional']['ballots_counted'] += val
-
-        # Turnout (Section F)
-        # F1a = Total ballots cast/counted
-        val = safe_int(row.get('F1a'))
-        if val: state['turnout']['total_ballots_cast'] += val
-
-    return dict(states)
+        plan = plans.get(state_code)
+        if plan is None:
+            plan = plans[state_code] = [(i, state[section], key) for i, section, key in columns]
+        for i, totals, key in plan:
+            val = _safe_int(row[i])
+            if val: totals[key] += val
+
+    return dict(states), row_count
 
 def calculate_derived_stats(states):
     """Calculate derived statistics like percentages"""
@@ -208,6 +197,19 @@ def calculate_derived_stats(states):
 
     return states
 
+def clean_zeros(state):
+    """Replace zero values with None for cleaner display, in place
+
+    The state schema is fixed at two levels (scalars plus one level of
+    section dicts), so this walks the sections directly instead of recursing.
+    """
+    for section in state.values():
+        if isinstance(section, dict):
+            for key, val in section.items():
+                if val == 0:
+                    section[key] = None
+    return state
+
 def format_for_output(states):
     """Format the data for JSON output with metadata"""
     output = {
@@ -218,17 +220,9 @@ def format_for_output(states):
             'url': 'https://www.eac.gov/research-and-data/studies-and-reports',
             'notes': 'Data aggregated from jurisdiction-level reports',
         },
-        'states': {}
-    }
-
-    for state_code, state in sorted(states.items()):
         # Clean up zeros to None for cleaner display
-        def clean_zeros(d):
-            if isinstance(d, dict):
-                return {k: clean_zeros(v) for k, v in d.items()}
-            return d if d != 0 else None
-
-        output['states'][state_code] = clean_zeros(state)
+        'states': {code: clean_zeros(states[code]) for code in sorted(states)},
+    }
 
     return output
 
@@ -248,15 +242,14 @@ def main():
 
     print(f"Reading EAVS data from: {csv_path}")
 
-    # Read CSV
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-
-    print(f"Loaded {len(rows)} jurisdiction records")
+    # Stream the CSV straight into the aggregation rather than loading every row,
+    # through a 1 MiB read buffer since the file is large and read sequentially
+    with open(csv_path, 'r', encoding='utf-8', newline='', buffering=1 << 20) as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        states, row_count = aggregate_state_data(reader, header)
 
-    # Aggregate by state
-    states = aggregate_state_data(rows)
+    print(f"Loaded {row_count} jurisdiction records")
     print(f"Aggregated data for {len(states)} states/territories")
 
     # Calculate derived statistics
@@ -265,11 +258,15 @@ def main():
     # Format for output
     output = format_for_output(states)
 
-    # Write to all output locations
-    for output_path in outputs:
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output, f, indent=2)
+    # Indented copy for the scraper data dir; the MCP server and website only
+    # read theirs programmatically, so they share one compact file (hardlinked)
+    canonical, consumers = outputs[0], outputs[1:]
+    write_json(canonical, output)
+    print(f"Wrote: {canonical}")
+    write_json(consumers[0], output, compact=True)
+    print(f"Wrote: {consumers[0]}")
+    for output_path in consumers[1:]:
+        link_or_copy(consumers[0], output_path)
         print(f"Wrote: {output_path}")
 
     # Print sample
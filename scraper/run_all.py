@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Run the election data validators in one process.
+
+Runs validate.py (election_dates.json) then validate_specials.py
+(special_elections.json), sharing one interpreter start and module imports.
+
+Usage:
+    python run_all.py                  # Validate and generate both outputs
+    python run_all.py --skip-validate  # Passed through to validate_specials
+"""
+
+import validate
+import validate_specials
+
+
+def main(argv=None):
+    validate.main()
+    print()
+    return validate_specials.main(argv)
+
+
+if __name__ == "__main__":
+    exit(main())
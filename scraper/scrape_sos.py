@@ -5,37 +5,54 @@ Fetches election dates from official state sources.
 
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 import requests
 from bs4 import BeautifulSoup
 
-from config import STATE_SOURCES, KNOWN_2026_DATES, PILOT_STATES, STATE_NAMES
+from config import STATE_SOURCES, KNOWN_2026_DATES, PILOT_STATES, STATE_NAMES, make_session
 
-# Common date patterns found on election websites
-DATE_PATTERNS = [
+# Common date patterns found on election websites (compiled once)
+DATE_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
     # "August 4, 2026" or "August 04, 2026"
     r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2}),?\s+(\d{4})",
     # "08/04/2026" or "8/4/2026"
     r"(\d{1,2})/(\d{1,2})/(\d{4})",
     # "2026-08-04"
     r"(\d{4})-(\d{2})-(\d{2})",
-]
+)]
 
 # Keywords that indicate primary or general elections
 PRIMARY_KEYWORDS = ["primary", "primary election", "primaries"]
 GENERAL_KEYWORDS = ["general", "general election", "november"]
+ELECTION_TYPE_KEYWORDS = {
+    **{keyword: "primary" for keyword in PRIMARY_KEYWORDS},
+    **{keyword: "general" for keyword in GENERAL_KEYWORDS},
+}
+# One alternation over every keyword (longest first), mapped back to its type
+CLASSIFY_RE = re.compile(
+    "|".join(map(re.escape, sorted(ELECTION_TYPE_KEYWORDS, key=len, reverse=True))),
+    re.IGNORECASE,
+)
+
+# Concurrent page fetches (network-bound); parsing stays sequential
+MAX_WORKERS = 8
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 }
 
+# One shared session so pages on the same host reuse pooled connections
+SESSION = make_session(MAX_WORKERS, retries=2)
+SESSION.headers.update(HEADERS)
+
 
 def fetch_page(url: str, timeout: int = 15) -> str | None:
     """Fetch a web page and return its HTML content."""
     try:
-        response = requests.get(url, headers=HEADERS, timeout=timeout)
+        response = SESSION.get(url, timeout=timeout)
         response.raise_for_status()
         return response.text
     except requests.RequestException as e:
@@ -48,7 +65,7 @@ def extract_dates_from_text(text: str) -> list[dict]:
     dates = []
 
     # Pattern 1: Month DD, YYYY
-    for match in re.finditer(DATE_PATTERNS[0], text, re.IGNORECASE):
+    for match in DATE_PATTERNS[0].finditer(text):
         month_name, day, year = match.groups()
         try:
             date_str = f"{month_name} {day}, {year}"
@@ -66,21 +83,22 @@ def extract_dates_from_text(text: str) -> list[dict]:
 
 def classify_election_type(context: str) -> str | None:
     """Determine if a date is for primary or general election based on context."""
-    context_lower = context.lower()
+    # Single pass; a primary keyword anywhere wins over a general one
+    election_type = None
+    for match in CLASSIFY_RE.finditer(context):
+        election_type = ELECTION_TYPE_KEYWORDS[match[0].lower()]
+        if election_type == "primary":
+            break
 
-    for keyword in PRIMARY_KEYWORDS:
-        if keyword in context_lower:
-            return "primary"
+    return election_type
 
-    for keyword in GENERAL_KEYWORDS:
-        if keyword in context_lower:
-            return "general"
 
-    return None
+def scrape_state(state_code: str, pending=None) -> dict:
+    """Scrape election dates from a state's SOS website.
 
-
-def scrape_state(state_code: str) -> dict:
-    """Scrape election dates from a state's SOS website."""
+    `pending` is an optional future already fetching the calendar page
+    (see scrape_all_pilot_states); otherwise the page is fetched here.
+    """
     config = STATE_SOURCES.get(state_code)
     if not config:
         return {
@@ -117,7 +135,7 @@ def scrape_state(state_code: str) -> dict:
         return result
 
     # Fetch and parse HTML
-    html = fetch_page(config["calendar_url"])
+    html = pending.result() if pending is not None else fetch_page(config["calendar_url"])
     if not html:
         result["scrape_status"] = "fetch_failed"
         # Fall back to known dates
@@ -172,8 +190,16 @@ def scrape_all_pilot_states() -> dict:
 
     print(f"\nScraping {len(PILOT_STATES)} pilot states...\n")
 
+    # Fetch HTML calendars concurrently, then parse them in order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        pending = {
+            code: pool.submit(fetch_page, STATE_SOURCES[code]["calendar_url"])
+            for code in PILOT_STATES
+            if code in STATE_SOURCES and STATE_SOURCES[code]["calendar_type"] != "pdf"
+        }
+
     for state_code in PILOT_STATES:
-        results[state_code] = scrape_state(state_code)
+        results[state_code] = scrape_state(state_code, pending.get(state_code))
         print(f"  Primary: {results[state_code]['primary_date']}")
         print(f"  General: {results[state_code]['general_date']}")
         print()
@@ -10,9 +10,11 @@ Usage:
 
 import argparse
 import csv
-import json
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import urljoin
 
@@ -23,31 +25,49 @@ from bs4 import BeautifulSoup
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 
-# State names
-STATE_NAMES = {
-    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
-    "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware", "FL": "Florida", "GA": "Georgia",
-    "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois", "IN": "Indiana", "IA": "Iowa",
-    "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana", "ME": "Maine", "MD": "Maryland",
-    "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota", "MS": "Mississippi", "MO": "Missouri",
-    "MT": "Montana", "NE": "Nebraska", "NV": "Nevada", "NH": "New Hampshire", "NJ": "New Jersey",
-    "NM": "New Mexico", "NY": "New York", "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio",
-    "OK": "Oklahoma", "OR": "Oregon", "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina",
-    "SD": "South Dakota", "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont",
-    "VA": "Virginia", "WA": "Washington", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming"
-}
-
-ALL_STATES = list(STATE_NAMES.keys())
+# State tables live in scraper/config.py; make it importable when run as a script
+sys.path.insert(0, str(SCRIPT_DIR.parent))
+from config import ALL_STATES, STATE_NAMES, make_session, write_json
+
 PRIORITY_STATES = ["FL", "NJ", "AL", "TX", "MI", "MN", "PA", "GA", "OH", "CA", "NY"]
 
-# Date parsing patterns
-DATE_PATTERNS = [
-    (r"(\w+ \d{1,2},? \d{4})", ["%B %d, %Y", "%B %d %Y"]),
-    (r"(\d{1,2}/\d{1,2}/\d{4})", ["%m/%d/%Y"]),
-    (r"(\d{4}-\d{2}-\d{2})", ["%Y-%m-%d"]),
-]
+# Date parsing patterns and the formats to try on each match
+DATE_FORMATS = (
+    (r"\w+ \d{1,2},? \d{4}", ["%B %d, %Y", "%B %d %Y"]),
+    (r"\d{1,2}/\d{1,2}/\d{4}", ["%m/%d/%Y"]),
+    (r"\d{4}-\d{2}-\d{2}", ["%Y-%m-%d"]),
+)
+DATE_PATTERNS = [(re.compile(f"({pattern})"), formats) for pattern, formats in DATE_FORMATS]
+DATE_CORE = "|".join(pattern for pattern, _ in DATE_FORMATS)
+
+# Concurrent page fetches (network-bound); parsing stays on the main thread
+MAX_WORKERS = 16
 
 SPECIAL_KEYWORDS = ["special", "vacancy", "runoff", "fill", "called"]
+# Single case-insensitive pass instead of lowercasing and testing each keyword
+SPECIAL_RE = re.compile("|".join(map(re.escape, SPECIAL_KEYWORDS)), re.IGNORECASE)
+# Same keywords over the raw response bytes, to skip parsing pages without any
+SPECIAL_BYTES_RE = re.compile(SPECIAL_RE.pattern.encode(), re.IGNORECASE)
+
+# A date within PROXIMITY chars of a keyword (either side), so one pass over
+# the page text finds every candidate instead of re-scanning each element.
+# The trailing keyword is a lookahead so it can still lead the next match.
+PROXIMITY = 200
+PROX_RE = re.compile(
+    rf"(?:{SPECIAL_RE.pattern})[\s\S]{{0,{PROXIMITY}}}?(?P<after>{DATE_CORE})"
+    rf"|(?P<before>{DATE_CORE})(?=(?P<tail>[\s\S]{{0,{PROXIMITY}}}?(?:{SPECIAL_RE.pattern})))",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=4096)
+def _parse_one(raw, fmt):
+    """Parse `raw` with `fmt` into YYYY-MM-DD, or None; memoized since the
+    same date strings recur across a page and across states."""
+    try:
+        return datetime.strptime(raw, fmt).strftime("%Y-%m-%d")
+    except ValueError:
+        return None
 
 
 class SOSScraper:
@@ -55,7 +75,7 @@ class SOSScraper:
 
     def __init__(self):
         self.results = {}
-        self.session = requests.Session()
+        self.session = make_session(MAX_WORKERS)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0',
             'Accept': 'text/html,application/xhtml+xml',
@@ -77,12 +97,11 @@ class SOSScraper:
         if not text:
             return None
         for pattern, formats in DATE_PATTERNS:
-            for match in re.findall(pattern, text):
+            for match in pattern.findall(text):
                 for fmt in formats:
-                    try:
-                        return datetime.strptime(match, fmt).strftime("%Y-%m-%d")
-                    except ValueError:
-                        continue
+                    parsed = _parse_one(match, fmt)
+                    if parsed:
+                        return parsed
         return None
 
     def _is_future(self, date_str):
@@ -94,13 +113,27 @@ class SOSScraper:
         except ValueError:
             return False
 
-    def scrape_state(self, state_code):
-        """Scrape a single state's SOS website for special elections."""
+    def _state_url(self, state_code):
+        """URL to scrape for a state, or '' if the registry has none."""
+        registry = self.registry.get(state_code.upper(), {})
+        return registry.get("elections_url") or registry.get("sos_url", "")
+
+    def _fetch(self, url):
+        """Fetch a page, raising on HTTP errors."""
+        response = self.session.get(url, timeout=15)
+        response.raise_for_status()
+        return response
+
+    def scrape_state(self, state_code, pending=None):
+        """Scrape a single state's SOS website for special elections.
+
+        `pending` is an optional future already fetching the state's page
+        (see scrape_states); otherwise the page is fetched here.
+        """
         state_code = state_code.upper()
         state_name = STATE_NAMES.get(state_code, state_code)
-        registry = self.registry.get(state_code, {})
 
-        base_url = registry.get("elections_url") or registry.get("sos_url", "")
+        base_url = self._state_url(state_code)
         if not base_url:
             print(f"[{state_code}] No URL - skipping")
             return []
@@ -109,28 +142,35 @@ class SOSScraper:
 
         found = []
         try:
-            response = self.session.get(base_url, timeout=15)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, 'html.parser')
-            text = soup.get_text().lower()
-
-            if any(kw in text for kw in SPECIAL_KEYWORDS):
+            response = pending.result() if pending is not None else self._fetch(base_url)
+
+            # Most pages never mention a special election; check the raw bytes
+            # before paying for the parse
+            text = ''
+            if SPECIAL_BYTES_RE.search(response.content):
+                soup = BeautifulSoup(response.content, 'lxml')
+                for tag in soup(['script', 'style']):
+                    tag.decompose()
+                # One text extraction per page; whitespace-only strings are dropped
+                text = soup.get_text(' ', strip=True)
+
+            if SPECIAL_RE.search(text):
                 print(f"  Found special election keywords")
-                # Look for date-like patterns near special election mentions
-                for element in soup.find_all(['p', 'li', 'td', 'div', 'article']):
-                    elem_text = element.get_text()
-                    if any(kw in elem_text.lower() for kw in SPECIAL_KEYWORDS):
-                        parsed_date = self._parse_date(elem_text)
-                        if parsed_date and self._is_future(parsed_date):
-                            found.append({
-                                "state_code": state_code,
-                                "state_name": state_name,
-                                "date": parsed_date,
-                                "text": elem_text[:200].strip(),
-                                "source": base_url,
-                            })
-                            print(f"  + {parsed_date}: {elem_text[:60]}...")
+                # Look for dates near special election mentions; per-match
+                # method lookups are bound to locals for the loop
+                _parse, _fut, append = self._parse_date, self._is_future, found.append
+                for match in PROX_RE.finditer(text):
+                    parsed_date = _parse(match['after'] or match['before'])
+                    if parsed_date and _fut(parsed_date):
+                        snippet = " ".join((match[0] + (match['tail'] or '')).split())
+                        append({
+                            "state_code": state_code,
+                            "state_name": state_name,
+                            "date": parsed_date,
+                            "text": snippet[:200],
+                            "source": base_url,
+                        })
+                        print(f"  + {parsed_date}: {snippet[:60]}...")
             else:
                 print(f"  No special election keywords found")
 
@@ -152,18 +192,22 @@ class SOSScraper:
         print("SOS SPECIAL ELECTIONS SCRAPER")
         print("=" * 50)
 
-        for state in states:
-            self.scrape_state(state)
+        # Fetch all pages concurrently, then parse them in order
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            pending = {}
+            for state in states:
+                url = self._state_url(state)
+                if url:
+                    pending[state] = pool.submit(self._fetch, url)
+            for state in states:
+                self.scrape_state(state, pending.get(state))
 
         return self.results
 
     def save(self, filename="special_elections_from_sos.json"):
         """Save results to JSON."""
         output = DATA_DIR / filename
-        DATA_DIR.mkdir(exist_ok=True)
-
-        with open(output, "w", encoding="utf-8") as f:
-            json.dump(self.results, f, indent=2)
+        write_json(output, self.results)
 
         # Summary
         total = sum(r["count"] for r in self.results.values())
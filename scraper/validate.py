@@ -6,44 +6,170 @@ the final validated election_dates.json file.
 
 import csv
 import json
+import os
+import pickle
+import sys
+import tempfile
+from dataclasses import astuple, dataclass
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from config import link_or_copy, write_json
+
 DATA_DIR = Path(__file__).parent / "data"
 
+# Consumer copies (compact JSON)
+MCP_DATA_DIR = Path(__file__).parent.parent / "mcp-server" / "data"
+WEBSITE_PUBLIC_DIR = Path(__file__).parent.parent / "website" / "public"
+
+# Dates compared between statute rules and SOS data; each name is both a
+# StatuteRule attribute and a sos_scraped.json key
+DISCREPANCY_FIELDS = ("primary_date", "general_date")
+
+# sos_scraped.json files larger than this are streamed with ijson (if installed)
+# rather than parsed whole
+SOS_STREAM_THRESHOLD = 8 * 1024 * 1024
+
+
+# Bump when the parsed statute rules change shape so stale pickles are rebuilt
+_RULES_PICKLE_VERSION = 2
+
+
+@dataclass(slots=True, frozen=True)
+class StatuteRule:
+    """One state's row from statute_rules.csv."""
+    state_name: str
+    primary_date_rule: str
+    primary_date: str
+    general_date_rule: str
+    general_date: str
+    statute_reference: str
+    source_url: str
+    confidence_level: str
+    notes: str
+
 
 def load_statute_rules() -> dict:
-    """Load statute rules from CSV file."""
-    rules = {}
+    """Load statute rules from CSV file.
+
+    The parsed rules are pickled next to the CSV, keyed by its (mtime_ns, size),
+    so later runs skip the CSV parse until the file changes. Rules are pickled
+    as plain field tuples, so the pickle loads whether this module runs as a
+    script (__main__) or is imported.
+    """
     csv_path = DATA_DIR / "statute_rules.csv"
+    stat = csv_path.stat()
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    pkl_path = csv_path.with_suffix(".pkl")
+
+    try:
+        with open(pkl_path, "rb") as f:
+            version, cached_key, rows = pickle.load(f)
+        if version == _RULES_PICKLE_VERSION and cached_key == stat_key:
+            return {code: StatuteRule(*fields) for code, fields in rows.items()}
+    except Exception:
+        # Missing, truncated or corrupt pickle; reparse the CSV
+        pass
+
+    rules = parse_statute_rules(csv_path)
+    rows = {code: astuple(rule) for code, rule in rules.items()}
+
+    try:
+        # Unique temp file, so concurrent runs never write the same one
+        fd, tmp_name = tempfile.mkstemp(
+            dir=pkl_path.parent, prefix=f"{csv_path.stem}.", suffix=".pkl.tmp"
+        )
+    except OSError:
+        # Read-only data directory; just parse the CSV every run
+        return rules
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((_RULES_PICKLE_VERSION, stat_key, rows), f, protocol=5)
+        os.replace(tmp_name, pkl_path)
+    except OSError:
+        try:
+            os.remove(tmp_name)
+        except OSError:
+            pass
+
+    return rules
+
+
+def parse_statute_rules(csv_path: Path) -> dict:
+    """Parse the statute rules CSV into StatuteRules keyed by state code."""
+    rules = {}
+
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        # Resolve column positions once from the header
+        header = next(reader)
+        width = len(header)
+        col = {name: i for i, name in enumerate(header)}
+        i_code = col["state_code"]
+        i_name = col["state_name"]
+        i_primary_rule = col["primary_date_rule"]
+        i_primary = col["primary_date_2026"]
+        i_general_rule = col["general_date_rule"]
+        i_general = col["general_date_2026"]
+        i_reference = col["statute_reference"]
+        i_url = col["source_url"]
+        i_confidence = col["confidence_level"]
+        i_notes = col["notes"]
 
-    with open(csv_path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
         for row in reader:
-            rules[row["state_code"]] = {
-                "state_name": row["state_name"],
-                "primary_date_rule": row["primary_date_rule"],
-                "primary_date": row["primary_date_2026"],
-                "general_date_rule": row["general_date_rule"],
-                "general_date": row["general_date_2026"],
-                "statute_reference": row["statute_reference"],
-                "source_url": row["source_url"],
-                "confidence_level": row["confidence_level"],
-                "notes": row["notes"],
-            }
+            if not row:
+                continue
+            if len(row) < width:
+                # Short row: missing trailing fields read as empty
+                row += [""] * (width - len(row))
+            rules[row[i_code]] = StatuteRule(
+                state_name=row[i_name],
+                primary_date_rule=row[i_primary_rule],
+                primary_date=row[i_primary],
+                general_date_rule=row[i_general_rule],
+                general_date=row[i_general],
+                statute_reference=row[i_reference],
+                source_url=row[i_url],
+                confidence_level=row[i_confidence],
+                notes=row[i_notes],
+            )
 
     return rules
 
 
-def load_sos_scraped() -> dict:
-    """Load SOS scraped data from JSON file."""
+def load_sos_scraped(state_codes=None) -> dict:
+    """Load SOS scraped data from JSON file.
+
+    Large files are streamed state by state with ijson when it is installed;
+    if `state_codes` is given, only those states are kept while streaming, so
+    the rest are never held in memory together.
+    """
     json_path = DATA_DIR / "sos_scraped.json"
 
     if not json_path.exists():
         return {}
 
-    with open(json_path, "r") as f:
-        return json.load(f)
+    if ijson is not None and json_path.stat().st_size > SOS_STREAM_THRESHOLD:
+        with open(json_path, "rb") as f:
+            return {
+                code: state
+                for code, state in ijson.kvitems(f, "", use_float=True)
+                if state_codes is None or code in state_codes
+            }
+
+    with open(json_path, "rb") as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 
 def validate_dates(statute_rules: dict, sos_data: dict) -> list:
@@ -52,32 +178,33 @@ def validate_dates(statute_rules: dict, sos_data: dict) -> list:
     Returns a list of validated state records with confidence levels.
     """
     validated = []
+    today_str = datetime.now().strftime("%Y-%m-%d")
 
     for state_code, statute in statute_rules.items():
         sos = sos_data.get(state_code, {})
 
         record = {
             "state_code": state_code,
-            "state_name": statute["state_name"],
+            "state_name": statute.state_name,
             "next_primary": {
-                "date": statute["primary_date"],
-                "date_rule": statute["primary_date_rule"],
+                "date": statute.primary_date,
+                "date_rule": statute.primary_date_rule,
                 "type": "state_primary",
-                "statute_reference": statute["statute_reference"],
+                "statute_reference": statute.statute_reference,
                 "confidence": "High",
             },
             "next_general": {
-                "date": statute["general_date"],
-                "date_rule": statute["general_date_rule"],
+                "date": statute.general_date,
+                "date_rule": statute.general_date_rule,
                 "type": "general_election",
-                "statute_reference": statute["statute_reference"],
+                "statute_reference": statute.statute_reference,
                 "confidence": "High",
             },
             "sources": [
                 {
                     "type": "statute",
-                    "reference": statute["statute_reference"],
-                    "url": statute["source_url"],
+                    "reference": statute.statute_reference,
+                    "url": statute.source_url,
                     "extracted_from": "Election Law Navigator / State Statutes",
                 },
             ],
@@ -85,8 +212,8 @@ def validate_dates(statute_rules: dict, sos_data: dict) -> list:
                 "status": "validated",
                 "discrepancies": [],
             },
-            "last_updated": datetime.now().strftime("%Y-%m-%d"),
-            "notes": statute["notes"],
+            "last_updated": today_str,
+            "notes": statute.notes,
         }
 
         # Add SOS source if available
@@ -99,27 +226,21 @@ def validate_dates(statute_rules: dict, sos_data: dict) -> list:
             })
 
             # Check for discrepancies
-            sos_primary = sos.get("primary_date")
-            sos_general = sos.get("general_date")
-
-            if sos_primary and sos_primary != statute["primary_date"]:
-                record["validation"]["discrepancies"].append({
-                    "field": "primary_date",
-                    "statute_value": statute["primary_date"],
-                    "sos_value": sos_primary,
-                    "resolution": "Using statute value (authoritative)",
-                })
-
-            if sos_general and sos_general != statute["general_date"]:
-                record["validation"]["discrepancies"].append({
-                    "field": "general_date",
-                    "statute_value": statute["general_date"],
-                    "sos_value": sos_general,
-                    "resolution": "Using statute value (authoritative)",
-                })
-
-            if record["validation"]["discrepancies"]:
-                record["validation"]["status"] = "discrepancy_resolved"
+            validation = record["validation"]
+            discrepancies = validation["discrepancies"]
+            for field in DISCREPANCY_FIELDS:
+                sos_value = sos.get(field)
+                statute_value = getattr(statute, field)
+                if sos_value and sos_value != statute_value:
+                    discrepancies.append({
+                        "field": field,
+                        "statute_value": statute_value,
+                        "sos_value": sos_value,
+                        "resolution": "Using statute value (authoritative)",
+                    })
+
+            if discrepancies:
+                validation["status"] = "discrepancy_resolved"
                 # Keep confidence high since we're using statute as authoritative
 
         validated.append(record)
@@ -141,10 +262,9 @@ def generate_election_dates_json(validated: list) -> dict:
 
 
 def print_validation_report(validated: list):
-    """Print a validation report to console."""
-    print("\n" + "=" * 60)
-    print("VALIDATION REPORT")
-    print("=" * 60)
+    """Print a validation report to console (built up, then written once)."""
+    lines = ["\n" + "=" * 60, "VALIDATION REPORT", "=" * 60]
+    add = lines.append
 
     discrepancy_count = 0
 
@@ -155,22 +275,24 @@ def print_validation_report(validated: list):
         general = record["next_general"]["date"]
         status = record["validation"]["status"]
 
-        print(f"\n{state} ({name})")
-        print(f"  Primary: {primary}")
-        print(f"  General: {general}")
-        print(f"  Status: {status}")
+        add(f"\n{state} ({name})")
+        add(f"  Primary: {primary}")
+        add(f"  General: {general}")
+        add(f"  Status: {status}")
 
         if record["validation"]["discrepancies"]:
             discrepancy_count += len(record["validation"]["discrepancies"])
-            print("  Discrepancies:")
+            add("  Discrepancies:")
             for d in record["validation"]["discrepancies"]:
-                print(f"    - {d['field']}: statute={d['statute_value']}, sos={d['sos_value']}")
-                print(f"      Resolution: {d['resolution']}")
+                add(f"    - {d['field']}: statute={d['statute_value']}, sos={d['sos_value']}")
+                add(f"      Resolution: {d['resolution']}")
 
-    print("\n" + "=" * 60)
-    print(f"Total states validated: {len(validated)}")
-    print(f"Total discrepancies found: {discrepancy_count}")
-    print("=" * 60)
+    add("\n" + "=" * 60)
+    add(f"Total states validated: {len(validated)}")
+    add(f"Total discrepancies found: {discrepancy_count}")
+    add("=" * 60)
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main():
@@ -185,7 +307,7 @@ def main():
     print(f"  Loaded {len(statute_rules)} states from statute_rules.csv")
 
     print("\nLoading SOS scraped data...")
-    sos_data = load_sos_scraped()
+    sos_data = load_sos_scraped(statute_rules.keys())
     print(f"  Loaded {len(sos_data)} states from sos_scraped.json")
 
     # Validate
@@ -197,10 +319,19 @@ def main():
 
     # Save
     output_path = DATA_DIR / "election_dates.json"
-    with open(output_path, "w") as f:
-        json.dump(output, f, indent=2)
+    write_json(output_path, output)
     print(f"\nSaved validated data to {output_path}")
 
+    # Compact copy for the MCP server
+    mcp_dest = MCP_DATA_DIR / "election_dates.json"
+    write_json(mcp_dest, output, compact=True)
+    print(f"Saved compact copy to {mcp_dest}")
+
+    # Website public gets the same compact bytes (hardlinked)
+    web_dest = WEBSITE_PUBLIC_DIR / "election_dates.json"
+    link_or_copy(mcp_dest, web_dest)
+    print(f"Saved compact copy to {web_dest}")
+
     # Print report
     print_validation_report(validated)
 
@@ -4,12 +4,17 @@ Validate special elections data and generate JSON output.
 Reads from special_elections.csv and outputs special_elections.json.
 """
 
+import argparse
 import csv
-import json
-import shutil
-from datetime import datetime, date
+import re
+from collections import Counter, defaultdict, namedtuple
+from datetime import date
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
+from config import link_or_copy, write_json
+
 # Paths
 SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR / "data"
@@ -21,9 +26,9 @@ MCP_DATA_DIR = SCRIPT_DIR.parent / "mcp-server" / "data"
 WEBSITE_PUBLIC_DIR = SCRIPT_DIR.parent / "website" / "public"
 
 # Valid values
-VALID_LEVELS = {"federal", "state_legislative", "statewide"}
-VALID_STATUSES = {"announced", "scheduled", "runoff_pending", "completed", "cancelled"}
-VALID_CONFIDENCE = {"High", "Medium", "Low"}
+VALID_LEVELS = frozenset({"federal", "state_legislative", "statewide"})
+VALID_STATUSES = frozenset({"announced", "scheduled", "runoff_pending", "completed", "cancelled"})
+VALID_CONFIDENCE = frozenset({"High", "Medium", "Low"})
 
 # State name lookup
 STATE_NAMES = {
@@ -41,161 +46,207 @@ STATE_NAMES = {
 }
 
 
+# YYYY-MM-DD; month and day may be unpadded, as strptime("%Y-%m-%d") allowed
+DATE_RE = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})")
+
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str):
     """Parse a date string in YYYY-MM-DD format."""
     if not date_str or date_str.strip() == "":
         return None
+    m = DATE_RE.fullmatch(date_str.strip())
+    if m is None:
+        return None
     try:
-        return datetime.strptime(date_str.strip(), "%Y-%m-%d").date()
+        return date(int(m[1]), int(m[2]), int(m[3]))
     except ValueError:
         return None
 
 
-def validate_row(row, row_num):
-    """Validate a single CSV row. Returns (is_valid, errors, warnings)."""
+# CSV columns read per row; each row's stripped values become a Row
+CSV_FIELDS = (
+    "id", "state_code", "state_name", "office", "district", "level", "reason",
+    "vacancy_date", "primary_date", "general_date", "runoff_date",
+    "status", "confidence", "source_url", "notes",
+)
+Row = namedtuple("Row", CSV_FIELDS)
+
+
+def _one_of(valid):
+    """Allowed values for an error message, in a stable order."""
+    return ", ".join(sorted(valid))
+
+
+def validate_row(row, row_num, _states=STATE_NAMES, _levels=VALID_LEVELS,
+                 _statuses=VALID_STATUSES, _confidence=VALID_CONFIDENCE):
+    """Validate a single CSV row, given as a Row of stripped values.
+
+    Returns (is_valid, errors, warnings). The lookup tables are bound as
+    default arguments so the per-row membership tests use local lookups.
+    """
     errors = []
     warnings = []
 
     # Required fields
-    required = ["id", "state_code", "office", "level", "status", "confidence"]
-    for field in required:
-        if not row.get(field, "").strip():
+    required = (
+        ("id", row.id), ("state_code", row.state_code), ("office", row.office),
+        ("level", row.level), ("status", row.status), ("confidence", row.confidence),
+    )
+    for field, value in required:
+        if not value:
             errors.append(f"Missing required field: {field}")
 
     # Validate state code
-    state_code = row.get("state_code", "").strip()
-    if state_code and state_code not in STATE_NAMES:
-        errors.append(f"Invalid state_code: {state_code}")
+    if row.state_code and row.state_code not in _states:
+        errors.append(f"Invalid state_code: {row.state_code}")
 
     # Validate level
-    level = row.get("level", "").strip()
-    if level and level not in VALID_LEVELS:
-        errors.append(f"Invalid level: {level}. Must be one of {VALID_LEVELS}")
+    if row.level and row.level not in _levels:
+        errors.append(f"Invalid level: {row.level}. Must be one of {_one_of(_levels)}")
 
     # Validate status
-    status = row.get("status", "").strip()
-    if status and status not in VALID_STATUSES:
-        errors.append(f"Invalid status: {status}. Must be one of {VALID_STATUSES}")
+    if row.status and row.status not in _statuses:
+        errors.append(f"Invalid status: {row.status}. Must be one of {_one_of(_statuses)}")
 
     # Validate confidence
-    confidence = row.get("confidence", "").strip()
-    if confidence and confidence not in VALID_CONFIDENCE:
-        errors.append(f"Invalid confidence: {confidence}. Must be one of {VALID_CONFIDENCE}")
+    if row.confidence and row.confidence not in _confidence:
+        errors.append(f"Invalid confidence: {row.confidence}. Must be one of {_one_of(_confidence)}")
 
     # Validate dates
-    for date_field in ["vacancy_date", "primary_date", "general_date", "runoff_date"]:
-        date_str = row.get(date_field, "").strip()
+    dates = (
+        ("vacancy_date", row.vacancy_date), ("primary_date", row.primary_date),
+        ("general_date", row.general_date), ("runoff_date", row.runoff_date),
+    )
+    for date_field, date_str in dates:
         if date_str:
             parsed = parse_date(date_str)
             if parsed is None:
                 errors.append(f"Invalid date format for {date_field}: {date_str}. Use YYYY-MM-DD")
 
     # Must have at least one election date
-    has_date = any(row.get(f, "").strip() for f in ["primary_date", "general_date", "runoff_date"])
-    if not has_date and status not in ["announced", "cancelled"]:
+    has_date = row.primary_date or row.general_date or row.runoff_date
+    if not has_date and row.status not in ("announced", "cancelled"):
         warnings.append("No election date specified (primary, general, or runoff)")
 
     return len(errors) == 0, errors, warnings
 
 
-def load_and_validate_csv():
-    """Load CSV and validate all rows."""
+def load_and_validate_csv(validate=True):
+    """Load CSV and validate all rows.
+
+    Each row's fields are stripped once, then shared by validation and the
+    election object. With validate=False every non-empty row is accepted
+    as-is (for regenerating JSON from a CSV already known to be clean).
+    """
     special_elections = []
     all_errors = []
     all_warnings = []
 
-    with open(CSV_PATH, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
+    with open(CSV_PATH, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        width = len(header)
+        col = {name: i for i, name in enumerate(header)}
+        # Missing columns point one past the header, at the "" sentinel below
+        indexes = [col.get(name, width) for name in CSV_FIELDS]
+
+        for row_num, raw in enumerate(reader, start=2):  # Start at 2 (header is row 1)
+            if len(raw) < width:
+                raw += [""] * (width - len(raw))
+            # Drop stray trailing cells so index width is always the "" sentinel
+            raw[width:] = ("",)
+            row = Row._make([raw[i].strip() for i in indexes])
+
             # Skip empty rows
-            if not row.get("id", "").strip():
+            election_id = row.id
+            if not election_id:
                 continue
 
-            is_valid, errors, warnings = validate_row(row, row_num)
+            if validate:
+                is_valid, errors, warnings = validate_row(row, row_num)
+            else:
+                is_valid, errors, warnings = True, [], []
 
             if errors:
-                all_errors.append((row_num, row.get("id", "unknown"), errors))
+                all_errors.append((row_num, election_id, errors))
             if warnings:
-                all_warnings.append((row_num, row.get("id", "unknown"), warnings))
+                all_warnings.append((row_num, election_id, warnings))
 
             if is_valid:
                 # Build the election object
-                state_code = row["state_code"].strip()
                 election = {
-                    "id": row["id"].strip(),
-                    "state_code": state_code,
-                    "state_name": row.get("state_name", "").strip() or STATE_NAMES.get(state_code, ""),
-                    "office": row["office"].strip(),
-                    "district": row.get("district", "").strip() or None,
-                    "level": row["level"].strip(),
-                    "reason": row.get("reason", "").strip() or None,
+                    "id": election_id,
+                    "state_code": row.state_code,
+                    "state_name": row.state_name or STATE_NAMES.get(row.state_code, ""),
+                    "office": row.office,
+                    "district": row.district or None,
+                    "level": row.level,
+                    "reason": row.reason or None,
                     "dates": {
-                        "vacancy": row.get("vacancy_date", "").strip() or None,
-                        "primary": row.get("primary_date", "").strip() or None,
-                        "general": row.get("general_date", "").strip() or None,
-                        "runoff": row.get("runoff_date", "").strip() or None,
+                        "vacancy": row.vacancy_date or None,
+                        "primary": row.primary_date or None,
+                        "general": row.general_date or None,
+                        "runoff": row.runoff_date or None,
                     },
-                    "status": row["status"].strip(),
-                    "confidence": row["confidence"].strip(),
-                    "source_url": row.get("source_url", "").strip() or None,
-                    "notes": row.get("notes", "").strip() or None,
+                    "status": row.status,
+                    "confidence": row.confidence,
+                    "source_url": row.source_url or None,
+                    "notes": row.notes or None,
                 }
                 special_elections.append(election)
 
     return special_elections, all_errors, all_warnings
 
 
-def get_next_date(election):
-    """Get the next upcoming date for an election."""
-    today = date.today()
-    dates = []
+def get_next_date(election, today=None):
+    """Get the next upcoming date for an election (on or after `today`)."""
+    if today is None:
+        today = date.today()
+    dates = election["dates"]
 
-    for date_type in ["primary", "general", "runoff"]:
-        date_str = election["dates"].get(date_type)
+    # Single scan keeping the earliest upcoming date; ties keep the first type
+    best_date = best_type = None
+    for date_type in ("primary", "general", "runoff"):
+        date_str = dates.get(date_type)
         if date_str:
             parsed = parse_date(date_str)
-            if parsed and parsed >= today:
-                dates.append((parsed, date_type))
+            if parsed and parsed >= today and (best_date is None or parsed < best_date):
+                best_date, best_type = parsed, date_type
 
-    if dates:
-        dates.sort(key=lambda x: x[0])
-        return dates[0][0].isoformat(), dates[0][1]
-    return None, None
+    if best_date is None:
+        return None, None
+    return best_date.isoformat(), best_type
 
 
 def generate_json(special_elections):
     """Generate the JSON output structure."""
-    # Add next_date info to each election
+    today = date.today()
+
+    # Add next_date info to each election, pairing each with its sort key:
+    # by next date, with elections without dates at the end
+    keyed = []
     for election in special_elections:
-        next_date, next_type = get_next_date(election)
+        next_date, next_type = get_next_date(election, today)
         election["next_date"] = next_date
         election["next_date_type"] = next_type
+        keyed.append(((0, next_date) if next_date else (1, ""), election))
 
-    # Sort by next date (elections without dates go to end)
-    def sort_key(e):
-        if e["next_date"]:
-            return (0, e["next_date"])
-        return (1, "")
+    keyed.sort(key=itemgetter(0))
+    special_elections[:] = [election for _, election in keyed]
 
-    special_elections.sort(key=sort_key)
-
-    # Build by-state lookup
-    by_state = {}
-    for election in special_elections:
-        state = election["state_code"]
-        if state not in by_state:
-            by_state[state] = []
-        by_state[state].append(election["id"])
-
-    # Count by level
-    level_counts = {}
+    # Build by-state lookup and count by level in one pass
+    by_state = defaultdict(list)
+    level_counts = Counter()
     for election in special_elections:
-        level = election["level"]
-        level_counts[level] = level_counts.get(level, 0) + 1
+        by_state[election["state_code"]].append(election["id"])
+        level_counts[election["level"]] += 1
+    by_state = dict(by_state)
+    level_counts = dict(level_counts)
 
     output = {
         "metadata": {
-            "last_updated": date.today().isoformat(),
+            "last_updated": today.isoformat(),
             "sources": ["Ballotpedia", "State SOS Websites"],
             "election_count": len(special_elections),
             "by_level": level_counts,
@@ -208,7 +259,12 @@ def generate_json(special_elections):
     return output
 
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate special elections CSV and generate JSON")
+    parser.add_argument("--skip-validate", action="store_true",
+                        help="Skip row validation (CSV already known to be clean)")
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("Special Elections Validation")
     print("=" * 60)
@@ -218,7 +274,7 @@ def main():
         return 1
 
     print(f"\nReading: {CSV_PATH}")
-    special_elections, errors, warnings = load_and_validate_csv()
+    special_elections, errors, warnings = load_and_validate_csv(validate=not args.skip_validate)
 
     # Report errors
     if errors:
@@ -240,27 +296,27 @@ def main():
         print("\nValidation FAILED. Fix errors before generating JSON.")
         return 1
 
-    print(f"\nValidation PASSED: {len(special_elections)} special elections loaded")
+    if args.skip_validate:
+        print(f"\nLoaded {len(special_elections)} special elections (validation skipped)")
+    else:
+        print(f"\nValidation PASSED: {len(special_elections)} special elections loaded")
 
     # Generate JSON
     output = generate_json(special_elections)
 
     # Write to data directory
-    with open(JSON_PATH, "w", encoding="utf-8") as f:
-        json.dump(output, f, indent=2)
+    write_json(JSON_PATH, output)
     print(f"\nGenerated: {JSON_PATH}")
 
-    # Copy to MCP server
-    MCP_DATA_DIR.mkdir(parents=True, exist_ok=True)
+    # Compact copy for the MCP server
     mcp_dest = MCP_DATA_DIR / "special_elections.json"
-    shutil.copy(JSON_PATH, mcp_dest)
-    print(f"Copied to: {mcp_dest}")
+    write_json(mcp_dest, output, compact=True)
+    print(f"Copied to: {mcp_dest} (compact)")
 
-    # Copy to website public
-    WEBSITE_PUBLIC_DIR.mkdir(parents=True, exist_ok=True)
+    # Website public gets the same compact bytes (hardlinked)
     web_dest = WEBSITE_PUBLIC_DIR / "special_elections.json"
-    shutil.copy(JSON_PATH, web_dest)
-    print(f"Copied to: {web_dest}")
+    link_or_copy(mcp_dest, web_dest)
+    print(f"Copied to: {web_dest} (compact)")
 
     # Summary
     print("\n" + "=" * 60)